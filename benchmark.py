@@ -0,0 +1,84 @@
+"""
+Benchmarks for the solvers
+"""
+
+import time
+from collections.abc import Callable
+
+from dice_10001.chance_to_reach import ChanceToReachSolver, ExactChanceToReachSolver
+from dice_10001.expected_value import ExactExpectedValueSolver, ExpectedValueSolver
+from dice_10001.tables import solve_chance_table, solve_ev_table
+
+
+def _time(function: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def benchmark_exact() -> None:
+    """Compare the speed of the exact solvers to the float solvers"""
+    print("Exact integer solvers vs float solvers:")
+    cases: dict[str, tuple[Callable[[], object], Callable[[], object]]] = {
+        "ev": (
+            lambda: ExpectedValueSolver().estimate_evs(),
+            lambda: ExactExpectedValueSolver().estimate_evs(),
+        ),
+        "chance to reach 1000": (
+            lambda: ChanceToReachSolver().estimate_chances_to_reach(target=1000),
+            lambda: ExactChanceToReachSolver().estimate_chances_to_reach(target=1000),
+        ),
+        "chance to reach 2000": (
+            lambda: ChanceToReachSolver().estimate_chances_to_reach(target=2000),
+            lambda: ExactChanceToReachSolver().estimate_chances_to_reach(target=2000),
+        ),
+    }
+    for name, (float_solve, exact_solve) in cases.items():
+        float_time = _time(float_solve)
+        exact_time = _time(exact_solve)
+        print(
+            f"{name:<22} float {float_time:>7.2f}s  exact {exact_time:>7.2f}s  "
+            f"ratio {exact_time / float_time:.2f}"
+        )
+
+
+def _recursive_evs() -> object:
+    solver = ExpectedValueSolver()
+    return [solver.estimate_evs(score=score) for score in range(0, 1000, 50)]
+
+
+def _recursive_chances(target: int) -> object:
+    solver = ChanceToReachSolver()
+    return [
+        solver.estimate_chances_to_reach(score=score, target=target)
+        for score in range(0, target, 50)
+    ]
+
+
+def benchmark_tables() -> None:
+    """Compare the speed of the table solver to the recursive solvers"""
+    print("Table solver vs recursive solvers, for every score below 1000/the target:")
+    cases: dict[str, tuple[Callable[[], object], Callable[[], object]]] = {
+        "ev": (_recursive_evs, solve_ev_table),
+        "chance to reach 1000": (
+            lambda: _recursive_chances(1000),
+            lambda: solve_chance_table(target=1000),
+        ),
+        "chance to reach 2000": (
+            lambda: _recursive_chances(2000),
+            lambda: solve_chance_table(target=2000),
+        ),
+    }
+    for name, (recursive_solve, table_solve) in cases.items():
+        recursive_time = _time(recursive_solve)
+        table_time = _time(table_solve)
+        print(
+            f"{name:<22} recursive {recursive_time:>7.2f}s  table {table_time:>7.2f}s  "
+            f"speedup {recursive_time / table_time:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    benchmark_exact()
+    print()
+    benchmark_tables()
@@ -0,0 +1,87 @@
+"""
+Module providing a bounded cache for the solvers
+"""
+
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True, slots=True)
+class CacheInfo:
+    """
+    Statistics for a cache
+
+    maxsize is None for unbounded caches
+    """
+
+    hits: int
+    misses: int
+    size: int
+    maxsize: int | None
+
+
+class BoundedCache(Generic[K, V]):
+    """
+    A mapping that evicts the least recently used entry when it grows past `maxsize`
+
+    maxsize: The maximum amount of entries to keep. None for no limit.
+    """
+
+    def __init__(self, maxsize: int | None = None) -> None:
+        assert maxsize is None or maxsize > 0
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[K, V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """Return the value stored for `key`, or None if it is not cached"""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if self.maxsize is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        """Store `value` for `key`, evicting the least recently used entry if full"""
+        self._entries[key] = value
+        if self.maxsize is not None:
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def update(self, entries: Mapping[K, V]) -> None:
+        """Store all the given entries"""
+        for key, value in entries.items():
+            self.put(key, value)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics"""
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def snapshot(self) -> dict[K, V]:
+        """Return a copy of the cached entries"""
+        return dict(self._entries)
+
+    def info(self) -> CacheInfo:
+        """Return the statistics for the cache"""
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._entries),
+            maxsize=self.maxsize,
+        )
@@ -2,51 +2,171 @@
 Module provinding functions for estimating the chance to reach a given score
 """
 
-from functools import cache
+from collections.abc import Callable, Mapping
+from typing import Generic
 
-from dice_10001.scoring import best_outcomes_per_dice_count
-from dice_10001.types import DiceCount, Score
+from dice_10001.cache import BoundedCache, CacheInfo
+from dice_10001.exact import FIXED_POINT_ARITHMETIC, FLOAT_ARITHMETIC, Arithmetic, N
+from dice_10001.scoring import SCORE_STEP, best_outcomes_per_dice_count
+from dice_10001.types import DiceCount, Outcome, Score
 
 
-@cache
-def estimate_chance_to_reach(
-    dice_count: int, score: Score, target: int, depth: int
-) -> float:
+class _ChanceToReachRecursion(Generic[N]):
     """
-    Estimate the chance to reach the target value from (dice_count, score)
+    The chance to reach recursion shared by the float and exact solvers
+
+    See `ChanceToReachSolver` for the arguments
     """
-    if score >= target:
-        return 1
-    if depth == 0:
-        return 0
 
-    outcomes_per_dice_count = best_outcomes_per_dice_count()[dice_count]
-    total_weight = 0
-    total_score = 0.0
-    for outcomes, weight in outcomes_per_dice_count.items():
-        total_weight += weight
+    arithmetic: Arithmetic[N]
+
+    def __init__(
+        self,
+        maxsize: int | None = None,
+        outcomes_per_dice_count: (
+            Mapping[int, Mapping[tuple[Outcome, ...], int]] | None
+        ) = None,
+    ) -> None:
+        self.cache: BoundedCache[tuple[int, Score, int, int], N] = BoundedCache(maxsize)
+        self.outcomes_per_dice_count = (
+            outcomes_per_dice_count or best_outcomes_per_dice_count()
+        )
+        # Looks up states missing from the cache, keyed by (dice, score, target, depth)
+        self.loader: Callable[[tuple[int, Score, int, int]], N | None] = (
+            lambda key: None
+        )
+
+    def _estimate_chance_to_reach(
+        self, dice_count: int, score: Score, target: int, depth: int
+    ) -> N:
+        """Estimate the chance to reach the target value from (dice_count, score)"""
+        if score >= target:
+            return self.arithmetic.scale(1)
+        if depth == 0:
+            return self.arithmetic.scale(0)
+
+        key = (dice_count, score, target, depth)
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = self.loader(key)
+            if cached is not None:
+                self.update({key: cached})
+        if cached is not None:
+            return cached
+
+        total_weight = 0
+        total_score = self.arithmetic.scale(0)
+        for outcomes, weight in self.outcomes_per_dice_count[dice_count].items():
+            total_weight += weight
 
-        if outcomes[0].dice == DiceCount.BUST:
-            assert len(outcomes) == 1
-            continue
+            if outcomes[0].dice == DiceCount.BUST:
+                assert len(outcomes) == 1
+                continue
 
-        max_ev = max(
-            estimate_chance_to_reach(
-                outcome.dice, score + outcome.points, target, depth - 1
+            max_ev = max(
+                self._estimate_chance_to_reach(
+                    outcome.dice, score + outcome.points, target, depth - 1
+                )
+                for outcome in outcomes
             )
-            for outcome in outcomes
+
+            total_score += max_ev * weight
+
+        chance = self.arithmetic.mean(total_score, total_weight)
+
+        self.cache.put(key, chance)
+        return chance
+
+    def estimate_chance_to_reach(
+        self, dice_count: int, score: Score, target: int, depth: int
+    ) -> float:
+        """
+        Estimate the chance to reach the target value from (dice_count, score)
+        """
+        return self.arithmetic.to_float(
+            self._estimate_chance_to_reach(dice_count, score, target, depth)
         )
 
-        total_score += max_ev * weight
+    def estimate_chances_to_reach(
+        self, score: Score = 0, target: int = 1000
+    ) -> dict[int, float]:
+        """Return a mapping from dice count to estimated chance"""
+        chances = {}
+        for dice_count in range(1, 7):
+            chances[dice_count] = self.estimate_chance_to_reach(
+                dice_count, score, target=target, depth=target // SCORE_STEP + 1
+            )
+        return chances
+
+    def update(self, states: Mapping[tuple[int, Score, int, int], N]) -> None:
+        """Add solved states keyed by (dice, score, target, depth) to the cache"""
+        self.cache.update(states)
+
+    def clear(self) -> None:
+        """Clear the cache and its statistics"""
+        self.cache.clear()
+
+    def snapshot(self) -> dict[tuple[int, Score, int, int], N]:
+        """Return a copy of the cached states keyed by (dice, score, target, depth)"""
+        return self.cache.snapshot()
+
+    def cache_info(self) -> CacheInfo:
+        """Return the statistics for the cache"""
+        return self.cache.info()
+
+
+class ChanceToReachSolver(_ChanceToReachRecursion[float]):
+    """
+    Solver for the chance to reach a given score that owns its cache
+
+    maxsize: The maximum amount of cached states. None for no limit.
+             Evicted states are recomputed when needed, so a small cache trades
+             speed for memory, but gives the same results.
+    outcomes_per_dice_count: The outcome groups to use. Defaults to
+                             `best_outcomes_per_dice_count()`.
+    """
+
+    arithmetic = FLOAT_ARITHMETIC
+
+
+class ExactChanceToReachSolver(_ChanceToReachRecursion[int]):
+    """
+    Solver for the chance to reach a given score using exact integer arithmetic
+
+    Chances are fixed point integers scaled by `SCALE`. The weighted sums are exact,
+    so the results are bit-identical regardless of the order the outcomes are summed
+    in. The cached states and the snapshot hold the scaled chances.
+
+    See `ChanceToReachSolver` for the arguments
+    """
+
+    arithmetic = FIXED_POINT_ARITHMETIC
 
-    return total_score / total_weight
+    def estimate_scaled_chance_to_reach(
+        self, dice_count: int, score: Score, target: int, depth: int
+    ) -> int:
+        """
+        Estimate the chance to reach the target as a fixed point integer scaled by
+        `SCALE`
+        """
+        return self._estimate_chance_to_reach(dice_count, score, target, depth)
+
+
+# Solver backing the module level functions. Its cache is unbounded.
+DEFAULT_CHANCE_SOLVER = ChanceToReachSolver()
+
+
+def estimate_chance_to_reach(
+    dice_count: int, score: Score, target: int, depth: int
+) -> float:
+    """
+    Estimate the chance to reach the target value from (dice_count, score)
+    """
+    return DEFAULT_CHANCE_SOLVER.estimate_chance_to_reach(
+        dice_count, score, target, depth
+    )
 
 
 def estimate_chances_to_reach(score: Score = 0, target: int = 1000) -> dict[int, float]:
     """Return a mapping from dice count to estimated ev"""
-    evs = {}
-    for dice_count in range(1, 7):
-        evs[dice_count] = estimate_chance_to_reach(
-            dice_count, score, target=target, depth=target // 50 + 1
-        )
-    return evs
+    return DEFAULT_CHANCE_SOLVER.estimate_chances_to_reach(score, target)
@@ -0,0 +1,200 @@
+"""
+Module providing functions for building decision matrices for all rolls
+
+A decision matrix holds the best decision for every sorted roll of a given dice count
+at each of a range of scores, along with the margin to the second best decision.
+"""
+
+import csv
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import TextIO
+
+from dice_10001.chance_to_reach import DEFAULT_CHANCE_SOLVER, ChanceToReachSolver
+from dice_10001.expected_value import DEFAULT_EV_SOLVER, ExpectedValueSolver
+from dice_10001.generate import generate_rolls
+from dice_10001.scoring import SCORE_STEP, get_best_outcomes
+from dice_10001.types import DiceCount, Outcome, Roll, Score
+
+
+@dataclass(frozen=True, slots=True, order=True)
+class Decision:
+    """
+    A decision made after a roll
+
+    Stores the outcome kept from the roll, and whether to roll the remaining dice
+    """
+
+    outcome: Outcome
+    roll_again: bool
+
+
+@dataclass(frozen=True, slots=True)
+class DecisionMatrix:
+    """
+    The best decision for every sorted roll of `dice_count` dice at each score
+
+    The matrices are indexed as [roll index][score index], following the order of
+    `rolls` and `scores`. Bust rolls have no decision, a value equal to the value of
+    busting and a margin of 0.
+
+    values: The value of the best decision under the chosen objective
+    margins: The difference in value between the best and second best decision.
+             0 if there is only one possible decision.
+    """
+
+    dice_count: int
+    rolls: tuple[Roll, ...]
+    scores: tuple[Score, ...]
+    decisions: tuple[tuple[Decision | None, ...], ...]
+    values: tuple[tuple[float, ...], ...]
+    margins: tuple[tuple[float, ...], ...]
+
+    def write_csv(self, file: TextIO) -> None:
+        """Write the matrix to `file` as csv with one row per (roll, score)"""
+        writer = csv.writer(file)
+        writer.writerow(
+            ("roll", "score", "points", "dice", "roll_again", "value", "margin")
+        )
+        for i, roll in enumerate(self.rolls):
+            for j, score in enumerate(self.scores):
+                decision = self.decisions[i][j]
+                writer.writerow(
+                    (
+                        " ".join(map(str, roll)),
+                        score,
+                        "" if decision is None else decision.outcome.points,
+                        "" if decision is None else decision.outcome.dice,
+                        "" if decision is None else int(decision.roll_again),
+                        self.values[i][j],
+                        self.margins[i][j],
+                    )
+                )
+
+
+def _evaluate_outcomes(
+    outcomes: tuple[Outcome, ...],
+    scores: tuple[Score, ...],
+    evaluate: Callable[[Decision, Score], float],
+    bust_value: Callable[[Score], float],
+) -> tuple[list[Decision | None], list[float], list[float]]:
+    """Return the best decisions, their values, and their margins at each score"""
+    if outcomes[0].dice == DiceCount.BUST:
+        assert len(outcomes) == 1
+        return (
+            [None] * len(scores),
+            [bust_value(score) for score in scores],
+            [0.0] * len(scores),
+        )
+
+    # Stopping is listed first so that it is preferred on ties
+    decisions = tuple(
+        Decision(outcome, roll_again)
+        for outcome in outcomes
+        for roll_again in (False, True)
+    )
+    best_decisions: list[Decision | None] = []
+    best_values: list[float] = []
+    margins: list[float] = []
+    for score in scores:
+        values = [evaluate(decision, score) for decision in decisions]
+        best_index = max(range(len(values)), key=values.__getitem__)
+        best_value = values.pop(best_index)
+
+        best_decisions.append(decisions[best_index])
+        best_values.append(best_value)
+        margins.append(best_value - max(values) if values else 0.0)
+
+    return best_decisions, best_values, margins
+
+
+def _build_decision_matrix(
+    dice_count: int,
+    scores: Iterable[Score],
+    evaluate: Callable[[Decision, Score], float],
+    bust_value: Callable[[Score], float],
+) -> DecisionMatrix:
+    """
+    Build the decision matrix using `evaluate` to score each decision at a score
+
+    Rolls with the same best outcomes share the same decisions, so each group of
+    best outcomes is evaluated only once per score.
+    """
+    assert 0 < dice_count <= 6
+
+    scores = tuple(scores)
+    rolls = tuple(roll for roll, weight in generate_rolls(dice_count))
+
+    outcomes_per_roll = tuple(tuple(sorted(get_best_outcomes(roll))) for roll in rolls)
+    rows_per_outcomes = {
+        outcomes: _evaluate_outcomes(outcomes, scores, evaluate, bust_value)
+        for outcomes in set(outcomes_per_roll)
+    }
+
+    rows = tuple(rows_per_outcomes[outcomes] for outcomes in outcomes_per_roll)
+    return DecisionMatrix(
+        dice_count=dice_count,
+        rolls=rolls,
+        scores=scores,
+        decisions=tuple(tuple(row[0]) for row in rows),
+        values=tuple(tuple(row[1]) for row in rows),
+        margins=tuple(tuple(row[2]) for row in rows),
+    )
+
+
+def build_ev_decision_matrix(
+    dice_count: int,
+    scores: Iterable[Score],
+    limit: int = 0,
+    solver: ExpectedValueSolver = DEFAULT_EV_SOLVER,
+) -> DecisionMatrix:
+    """
+    Build the decision matrix that maximizes expected value
+
+    The values are the expected net gain for the rest of the turn after making the
+    decision, as in `estimate_ev`. Busting is valued as the loss of the score.
+
+    limit: The minimum score that is treated as a loss if you bust. See `estimate_ev`
+    solver: The solver used to estimate the expected value of rolling again
+    """
+
+    def evaluate(decision: Decision, score: Score) -> float:
+        ev: float = decision.outcome.points
+        if decision.roll_again:
+            ev += solver.estimate_ev(
+                decision.outcome.dice, score + decision.outcome.points, limit=limit
+            )
+        return ev
+
+    return _build_decision_matrix(
+        dice_count,
+        scores,
+        evaluate,
+        lambda score: -score if score >= limit else 0,
+    )
+
+
+def build_chance_decision_matrix(
+    dice_count: int,
+    scores: Iterable[Score],
+    target: int = 1000,
+    solver: ChanceToReachSolver = DEFAULT_CHANCE_SOLVER,
+) -> DecisionMatrix:
+    """
+    Build the decision matrix that maximizes the chance to reach `target`
+
+    The values are the chance to reach `target` this turn after making the decision.
+
+    solver: The solver used to estimate the chance to reach `target` when rolling again
+    """
+    depth = target // SCORE_STEP + 1
+
+    def evaluate(decision: Decision, score: Score) -> float:
+        new_score = score + decision.outcome.points
+        if decision.roll_again:
+            return solver.estimate_chance_to_reach(
+                decision.outcome.dice, new_score, target, depth
+            )
+        return 1.0 if new_score >= target else 0.0
+
+    return _build_decision_matrix(dice_count, scores, evaluate, lambda score: 0.0)
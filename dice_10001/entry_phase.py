@@ -0,0 +1,207 @@
+"""
+Module providing a solver for the entry phase of the game
+
+Before getting on the board, a player must bank at least `threshold` points in a
+single turn. The solver finds the strategy that minimizes the expected number of
+turns until this happens, optionally rewarding the expected surplus banked.
+
+The cost of a strategy is `expected_turns - surplus_weight * expected_score`, where
+expected_score is the expected amount of points banked when getting on the board.
+Busting restarts the turn, so the cost of busting is the cost of the whole entry phase.
+The solver finds this fixed point with policy iteration: each iteration computes the
+best decisions given the current cost of busting in one sweep down the score axis,
+and then computes the exact cost of those decisions.
+
+With surplus_weight 0 the optimal strategy maximizes the chance to reach `threshold`
+within a turn, and the expected amount of turns is 1 / `estimate_chance_to_reach`.
+
+Expected turns to bank the entry threshold:
+ 500: 1.76
+1000: 3.06
+1500: 5.55
+2000: 9.08
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from dice_10001.scoring import SCORE_STEP, best_outcomes_per_dice_count
+from dice_10001.types import DiceCount, Score
+
+# Score cap above the threshold when rewarding surplus
+SURPLUS_SCORE_CAP = 20_000
+
+
+@dataclass(frozen=True, slots=True)
+class EntryStrategy:  # pylint: disable=too-many-instance-attributes
+    """
+    The optimal strategy for getting on the board with `threshold` points
+
+    The tables are indexed as [dice_count][score index], following the order of
+    `scores`, and describe the state after keeping dice with `score` points this turn
+    and `dice_count` dice left to throw.
+
+    cost: expected_turns - surplus_weight * expected_score
+    roll_costs: The cost of rolling again from the state
+    should_roll: True if you should roll again, False if you should bank the points
+    """
+
+    threshold: int
+    surplus_weight: float
+    score_cap: int
+    cost: float
+    expected_turns: float
+    expected_score: float
+    scores: tuple[Score, ...]
+    roll_costs: dict[int, tuple[float, ...]]
+    should_roll: dict[int, tuple[bool, ...]]
+
+
+@dataclass(slots=True)
+class _Sweep:
+    """
+    The result of one sweep down the score axis for a given cost of busting
+
+    Along with the cost of each state, the chance of busting this turn and the
+    expected points banked this turn under the chosen decisions are kept, so that the
+    exact cost of the decisions can be computed.
+    """
+
+    costs: dict[int, list[float]]
+    bust_chances: dict[int, list[float]]
+    banked_scores: dict[int, list[float]]
+    roll_costs: dict[int, list[float]]
+    should_roll: dict[int, list[bool]]
+
+
+def _sweep(  # pylint: disable=too-many-locals
+    threshold: int, surplus_weight: float, score_cap: int, bust_cost: float
+) -> _Sweep:
+    """Find the best decisions at every state given the cost of busting"""
+    levels = score_cap // SCORE_STEP
+    sweep = _Sweep(
+        costs={dice_count: [0.0] * levels for dice_count in range(1, 7)},
+        bust_chances={dice_count: [0.0] * levels for dice_count in range(1, 7)},
+        banked_scores={dice_count: [0.0] * levels for dice_count in range(1, 7)},
+        roll_costs={dice_count: [0.0] * levels for dice_count in range(1, 7)},
+        should_roll={dice_count: [False] * levels for dice_count in range(1, 7)},
+    )
+
+    def get_state(dice_count: int, score: Score) -> tuple[float, float, float]:
+        """Return the cost, bust chance and banked score of the state"""
+        if score >= score_cap:
+            # The points are always banked at the cap
+            return -surplus_weight * score, 0.0, float(score)
+        level = score // SCORE_STEP
+        return (
+            sweep.costs[dice_count][level],
+            sweep.bust_chances[dice_count][level],
+            sweep.banked_scores[dice_count][level],
+        )
+
+    outcomes_per_dice_count = best_outcomes_per_dice_count()
+    for level in range(levels - 1, -1, -1):
+        score = level * SCORE_STEP
+        for dice_count in range(1, 7):
+            total_weight = 0
+            total_cost = total_bust_chance = total_banked_score = 0.0
+            for outcomes, weight in outcomes_per_dice_count[dice_count].items():
+                total_weight += weight
+
+                if outcomes[0].dice == DiceCount.BUST:
+                    assert len(outcomes) == 1
+                    total_cost += bust_cost * weight
+                    total_bust_chance += weight
+                    continue
+
+                cost, bust_chance, banked_score = min(
+                    get_state(outcome.dice, score + outcome.points)
+                    for outcome in outcomes
+                )
+                total_cost += cost * weight
+                total_bust_chance += bust_chance * weight
+                total_banked_score += banked_score * weight
+
+            roll_cost = total_cost / total_weight
+            sweep.roll_costs[dice_count][level] = roll_cost
+
+            bank_cost = -surplus_weight * score
+            if score >= threshold and bank_cost <= roll_cost:
+                sweep.costs[dice_count][level] = bank_cost
+                sweep.banked_scores[dice_count][level] = score
+            else:
+                sweep.costs[dice_count][level] = roll_cost
+                sweep.bust_chances[dice_count][level] = total_bust_chance / total_weight
+                sweep.banked_scores[dice_count][level] = (
+                    total_banked_score / total_weight
+                )
+                sweep.should_roll[dice_count][level] = True
+
+    return sweep
+
+
+def solve_entry_phase(
+    threshold: int = 1000,
+    surplus_weight: float = 0.0,
+    score_cap: int | None = None,
+    max_iterations: int = 100,
+) -> EntryStrategy:
+    """
+    Solve the entry phase for the given threshold
+
+    surplus_weight: The reduction in cost per point banked when getting on the board,
+                    measured in turns. 0 minimizes the expected amount of turns.
+    score_cap: The score where the points are always banked. Defaults to the
+               threshold, or `SURPLUS_SCORE_CAP` above it when rewarding surplus.
+    """
+    assert threshold > 0 and threshold % SCORE_STEP == 0
+    assert surplus_weight >= 0
+
+    if score_cap is None:
+        score_cap = threshold + (SURPLUS_SCORE_CAP if surplus_weight > 0 else 0)
+    assert score_cap >= threshold and score_cap % SCORE_STEP == 0
+
+    cost = 1.0
+    for iteration in range(max_iterations):
+        sweep = _sweep(threshold, surplus_weight, score_cap, bust_cost=cost)
+
+        # Every turn starts by rolling 6 dice at 0 points
+        bust_chance = sweep.bust_chances[6][0]
+        banked_score = sweep.banked_scores[6][0]
+
+        # Solve cost = 1 + bust_chance * cost - surplus_weight * banked_score
+        previous_cost = cost
+        cost = (1 - surplus_weight * banked_score) / (1 - bust_chance)
+
+        if iteration > 0 and abs(cost - previous_cost) <= 1e-12 * max(1, abs(cost)):
+            break
+    else:
+        raise RuntimeError(f"Entry phase did not converge in {max_iterations} steps")
+
+    return EntryStrategy(
+        threshold=threshold,
+        surplus_weight=surplus_weight,
+        score_cap=score_cap,
+        cost=cost,
+        expected_turns=1 / (1 - bust_chance),
+        expected_score=banked_score / (1 - bust_chance),
+        scores=tuple(range(0, score_cap, SCORE_STEP)),
+        roll_costs={
+            dice_count: tuple(roll_costs)
+            for dice_count, roll_costs in sweep.roll_costs.items()
+        },
+        should_roll={
+            dice_count: tuple(should_roll)
+            for dice_count, should_roll in sweep.should_roll.items()
+        },
+    )
+
+
+def solve_entry_phases(
+    thresholds: Iterable[int] = range(500, 2050, 50), surplus_weight: float = 0.0
+) -> dict[int, EntryStrategy]:
+    """Return a mapping from threshold to the optimal entry strategy"""
+    return {
+        threshold: solve_entry_phase(threshold, surplus_weight)
+        for threshold in thresholds
+    }
@@ -0,0 +1,55 @@
+"""
+Module providing fixed point helpers for the exact solvers
+
+Values are stored as integers scaled by `SCALE`. Since every weight is an integer,
+the weighted sums in the exact solvers are exact, and only the division by the total
+weight is rounded. The results are therefore independent of the order the sums are
+evaluated in.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+# Fixed point scale of the values in the exact solvers
+SCALE = 1 << 40
+
+
+def divide(numerator: int, denominator: int) -> int:
+    """Divide and round to the nearest integer, rounding halves up"""
+    assert denominator > 0
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def to_float(value: int) -> float:
+    """Convert a fixed point value to a float"""
+    return value / SCALE
+
+
+N = TypeVar("N", int, float)
+
+
+@dataclass(frozen=True, slots=True)
+class Arithmetic(Generic[N]):
+    """
+    The number type a solver computes its values in
+
+    The solvers share their recursion between floats and fixed point integers.
+
+    scale: Convert an integer amount of points or probability to a value
+    mean: Return the mean of values given their weighted sum and total weight
+    to_float: Convert a value to a float
+    """
+
+    scale: Callable[[int], N]
+    mean: Callable[[N, int], N]
+    to_float: Callable[[N], float]
+
+
+FLOAT_ARITHMETIC: Arithmetic[float] = Arithmetic(
+    scale=float, mean=lambda total, weight: total / weight, to_float=float
+)
+
+FIXED_POINT_ARITHMETIC: Arithmetic[int] = Arithmetic(
+    scale=lambda value: value * SCALE, mean=divide, to_float=to_float
+)
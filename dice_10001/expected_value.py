@@ -36,70 +36,252 @@ Minimum score for negative EV at given dice count:
 1:  1000
 """
 
-from functools import cache
+from collections import defaultdict
+from collections.abc import Callable, Mapping
+from typing import Generic
 
-from dice_10001.scoring import best_outcomes_per_dice_count
-from dice_10001.types import DiceCount, Score
+from dice_10001.cache import BoundedCache, CacheInfo
+from dice_10001.exact import FIXED_POINT_ARITHMETIC, FLOAT_ARITHMETIC, Arithmetic, N
+from dice_10001.scoring import SCORE_STEP, best_outcomes_per_dice_count
+from dice_10001.types import DiceCount, Outcome, Score
 
-# The minimum score you should stop at for a given dice count
-MIN_SCORE_FOR_NEGATIVE_EV = {i: 10_000_000 for i in range(1, 7)}
+# The score from which rolling any dice count has negative expected value at limit 0
+NEGATIVE_EV_SCORE = 18_100
+
+
+def converged_depth(score: Score, limit: int = 0) -> int:
+    """
+    Return the search depth from which the ev at `score` no longer depends on depth
+
+    Every roll gains at least `SCORE_STEP` points, so the search is cut off at least
+    `SCORE_STEP * depth` points above `score`. Past `NEGATIVE_EV_SCORE` and the limit
+    you always stop rolling, so cutting the search off there does not change the ev.
+    """
+    return max(1, -(-(max(limit, NEGATIVE_EV_SCORE) - score) // SCORE_STEP))
+
+
+def _new_min_scores() -> dict[int, int]:
+    return {i: 10_000_000 for i in range(1, 7)}
+
+
+class _ExpectedValueRecursion(Generic[N]):
+    """
+    The expected value recursion shared by the float and exact solvers
+
+    See `ExpectedValueSolver` for the arguments
+    """
+
+    arithmetic: Arithmetic[N]
+
+    def __init__(
+        self,
+        maxsize: int | None = None,
+        outcomes_per_dice_count: (
+            Mapping[int, Mapping[tuple[Outcome, ...], int]] | None
+        ) = None,
+    ) -> None:
+        self.cache: BoundedCache[tuple[int, Score, int, int], N] = BoundedCache(maxsize)
+        self.outcomes_per_dice_count = (
+            outcomes_per_dice_count or best_outcomes_per_dice_count()
+        )
+        # Looks up states missing from the cache, keyed by (dice, score, depth, limit)
+        self.loader: Callable[[tuple[int, Score, int, int]], N | None] = (
+            lambda key: None
+        )
+        # The minimum score you should stop at for a given limit and dice count.
+        # Only converged states are recorded, as the ev of states cut off by the
+        # search depth is too low.
+        self.min_score_for_negative_ev: defaultdict[int, dict[int, int]] = defaultdict(
+            _new_min_scores
+        )
+
+    def _estimate_ev(  # pylint: disable=too-many-locals
+        self, dice_count: int, score: Score, depth: int, limit: int
+    ) -> N:
+        """Estimate the expected value of rolling `dice_count` dice at `score`"""
+        if depth == 0:
+            # This is wrong, but made insignificant by high depths
+            return self.arithmetic.scale(0)
+
+        # Converged states share one cache entry for all depths past converged_depth
+        converged = converged_depth(score, limit)
+        key = (dice_count, score, min(depth, converged), limit)
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = self.loader(key)
+            if cached is not None:
+                self.update({key: cached})
+        if cached is not None:
+            return cached
+
+        scale = self.arithmetic.scale
+        min_scores = self.min_score_for_negative_ev[limit]
+        total_weight = 0
+        total_score = scale(0)
+        for outcomes, weight in self.outcomes_per_dice_count[dice_count].items():
+            total_weight += weight
+
+            if outcomes[0].dice == DiceCount.BUST:
+                assert len(outcomes) == 1
+                if score >= limit:
+                    total_score -= scale(score) * weight
+                continue
+
+            max_ev = scale(-1)
+            for outcome in outcomes:
+                branch_ev = scale(outcome.points)
+                if score + outcome.points < min_scores[outcome.dice]:
+                    subtree_ev = self._estimate_ev(
+                        outcome.dice, score + outcome.points, depth - 1, limit
+                    )
+                    if subtree_ev > 0:  # It is worth it to roll again
+                        branch_ev += subtree_ev
+
+                max_ev = max(max_ev, branch_ev)
+
+            assert max_ev >= 0
+
+            total_score += max_ev * weight
+
+        ev = self.arithmetic.mean(total_score, total_weight)
+
+        if ev < 0 and depth >= converged:
+            min_scores[dice_count] = min(min_scores[dice_count], score)
+
+        self.cache.put(key, ev)
+        return ev
+
+    def estimate_ev(
+        self, dice_count: int, score: Score, depth: int = 400, limit: int = 0
+    ) -> float:
+        """
+        Estimate the expected value of rolling `dice_count` dice with the given score
+
+        limit: The minimum score that is treated as a loss if you bust.
+               This is used to get a proxy for the expected value and minimum scores
+               when forced to reach the given score (1000 in the first round of the
+               game)
+
+        depth: Search depth for recursion. With limit 0, the maximum score cutoff is
+               18100. Since the minimum score per roll is 50, all rounds must reach
+               cutoff within 18100 / 50 = 362 depth. With a high limit, depth may need
+               to be increased. See `converged_depth`.
+        """
+        return self.arithmetic.to_float(
+            self._estimate_ev(dice_count, score, depth, limit)
+        )
+
+    def estimate_evs(
+        self, score: Score = 0, limit: int = 0, net_ev: bool = True
+    ) -> dict[int, float]:
+        """
+        Return a mapping from dice count to estimated ev
+
+        net_ev: If True, the ev is the expected net gain. If False, the ev is the
+                expected gain including the current score (expected score for the
+                whole turn).
+        """
+        evs = {}
+        for dice_count in range(1, 7):
+            evs[dice_count] = self.estimate_ev(dice_count, score, limit=limit) + (
+                0 if net_ev else score
+            )
+        return evs
+
+    def estimate_min_score_for_negative_ev(self, limit: int = 0) -> dict[int, int]:
+        """
+        Return the minimum score you should stop at for a given dice count
+
+        This can be used to play an ev-optimal game
+        """
+        self.estimate_evs(limit=limit)  # Ensure the min score lookup is populated
+        return dict(self.min_score_for_negative_ev[limit])
+
+    def reset_min_score_for_negative_ev(self) -> None:
+        """Reset the minimum score lookup"""
+        self.min_score_for_negative_ev.clear()
+
+    def clear(self) -> None:
+        """Clear the cache, its statistics and the minimum score lookup"""
+        self.cache.clear()
+        self.reset_min_score_for_negative_ev()
+
+    def update(self, states: Mapping[tuple[int, Score, int, int], N]) -> None:
+        """
+        Add solved states keyed by (dice, score, depth, limit) to the cache
+
+        Negative evs of converged states are added to the minimum score lookup
+        """
+        for (dice_count, score, depth, limit), ev in states.items():
+            converged = converged_depth(score, limit)
+            self.cache.put((dice_count, score, min(depth, converged), limit), ev)
+            if ev < 0 and depth >= converged:
+                min_scores = self.min_score_for_negative_ev[limit]
+                min_scores[dice_count] = min(min_scores[dice_count], score)
+
+    def snapshot(self) -> dict[tuple[int, Score, int, int], N]:
+        """Return a copy of the cached states keyed by (dice, score, depth, limit)"""
+        return self.cache.snapshot()
+
+    def cache_info(self) -> CacheInfo:
+        """Return the statistics for the cache"""
+        return self.cache.info()
+
+
+class ExpectedValueSolver(_ExpectedValueRecursion[float]):
+    """
+    Solver for the expected value of rolls that owns its cache
+
+    maxsize: The maximum amount of cached states. None for no limit.
+             Evicted states are recomputed when needed, so a small cache trades
+             speed for memory, but gives the same results.
+             Solving `estimate_evs()` caches about 3000 states, of which about 400
+             are in use at once. Below about 400 the solver recomputes evicted
+             states over and over, and slows down by orders of magnitude.
+    outcomes_per_dice_count: The outcome groups to use. Defaults to
+                             `best_outcomes_per_dice_count()`.
+    """
+
+    arithmetic = FLOAT_ARITHMETIC
+
+
+class ExactExpectedValueSolver(_ExpectedValueRecursion[int]):
+    """
+    Solver for the expected value of rolls using exact integer arithmetic
+
+    Values are fixed point integers scaled by `SCALE`. The weighted sums are exact, so
+    the results are bit-identical regardless of the order the outcomes are summed in.
+    The cached states and the snapshot hold the scaled values.
+
+    See `ExpectedValueSolver` for the arguments
+    """
+
+    arithmetic = FIXED_POINT_ARITHMETIC
+
+    def estimate_scaled_ev(
+        self, dice_count: int, score: Score, depth: int = 400, limit: int = 0
+    ) -> int:
+        """
+        Estimate the expected value as a fixed point integer scaled by `SCALE`
+
+        See `estimate_ev`
+        """
+        return self._estimate_ev(dice_count, score, depth, limit)
+
+
+# Solver backing the module level functions. Its cache is unbounded.
+DEFAULT_EV_SOLVER = ExpectedValueSolver()
 
 
-@cache
 def estimate_ev(
     dice_count: int, score: Score, depth: int = 400, limit: int = 0
 ) -> float:
     """
     Estimate the expected value of rolling `dice_count` dice with the given score
 
-    limit: The minimum score that is treated as a loss if you bust.
-           This is used to get a proxy for the expected value and minimum scores when
-           forced to reach the given score (1000 in the first round of the game)
-
-    depth: Search depth for recursion. With limit 0, the maximum score cutoff is 18100.
-           Since the minimum score per roll is 50, all rounds must reach cutoff within
-           18100 / 50 = 362 depth. With a high limit, depth may need to be increased.
+    See `ExpectedValueSolver.estimate_ev`
     """
-    if depth == 0:
-        # This is wrong, but made insignificant by high depths
-        return 0
-
-    outcomes_per_dice_count = best_outcomes_per_dice_count()[dice_count]
-    total_weight = 0
-    total_score = 0.0
-    for outcomes, weight in outcomes_per_dice_count.items():
-        total_weight += weight
-
-        if outcomes[0].dice == DiceCount.BUST:
-            assert len(outcomes) == 1
-            if score >= limit:
-                total_score -= score * weight
-            continue
-
-        max_ev = -1.0
-        for outcome in outcomes:
-            branch_ev: float = outcome.points
-            if score + outcome.points < MIN_SCORE_FOR_NEGATIVE_EV[outcome.dice]:
-                subtree_ev = estimate_ev(
-                    outcome.dice, score + outcome.points, depth - 1, limit
-                )
-                if subtree_ev > 0:  # It is worth it to roll again
-                    branch_ev += subtree_ev
-
-            max_ev = max(max_ev, branch_ev)
-
-        assert max_ev >= 0
-
-        total_score += max_ev * weight
-
-    ev = total_score / total_weight
-
-    if ev < 0:
-        MIN_SCORE_FOR_NEGATIVE_EV[dice_count] = min(
-            MIN_SCORE_FOR_NEGATIVE_EV[dice_count], score
-        )
-
-    return ev
+    return DEFAULT_EV_SOLVER.estimate_ev(dice_count, score, depth, limit)
 
 
 def estimate_evs(
@@ -108,28 +290,20 @@ def estimate_evs(
     """
     Return a mapping from dice count to estimated ev
 
-    net_ev: If True, the ev is the expected net gain. If False, the ev is the expected
-            gain including the current score (expected score for the whole turn).
+    See `ExpectedValueSolver.estimate_evs`
     """
-    evs = {}
-    for dice_count in range(1, 7):
-        evs[dice_count] = estimate_ev(dice_count, score, limit=limit) + (
-            0 if net_ev else score
-        )
-    return evs
+    return DEFAULT_EV_SOLVER.estimate_evs(score, limit, net_ev)
 
 
-def estimate_min_score_for_negative_ev() -> dict[int, int]:
+def estimate_min_score_for_negative_ev(limit: int = 0) -> dict[int, int]:
     """
     Return the minimum score you should stop at for a given dice count
 
     This can be used to play an ev-optimal game
     """
-    estimate_evs()  # Ensure the min score lookup is populated
-    return MIN_SCORE_FOR_NEGATIVE_EV
+    return DEFAULT_EV_SOLVER.estimate_min_score_for_negative_ev(limit)
 
 
 def reset_min_score_for_negative_ev() -> None:
     """Reset the minimum score lookup"""
-    global MIN_SCORE_FOR_NEGATIVE_EV  # pylint: disable=global-statement
-    MIN_SCORE_FOR_NEGATIVE_EV = {i: 10_000_000 for i in range(1, 7)}
+    DEFAULT_EV_SOLVER.reset_min_score_for_negative_ev()
@@ -21,6 +21,10 @@ POINTS_TABLE: Mapping[int, list[Score]] = {
     6: [0, 0, 0, 600, 1200, 2400, 4800],
 }
 
+# All points are multiples of this, and every scoring roll gains at least this much,
+# so scores are solved on this grid
+SCORE_STEP = 50
+
 
 def _get_frequencies(roll: Roll) -> dict[int, int]:
     """Return the frequency table for `roll`"""
@@ -0,0 +1,275 @@
+"""
+Module providing a persistent store for solved states
+
+Solved states are stored in an SQLite database, keyed by the ruleset, the objective
+(ev or chance to reach) and its parameter (the limit or the target). Solvers can be
+warmed from the store before solving, or read through to the store when a state is
+missing from their cache, so that only states missing from the store are computed.
+Their caches can be saved back to the store afterwards.
+
+Warming loads every stored state for the parameter into the cache at once, which
+suits unbounded solvers. Solvers with a bounded cache would evict most of the
+loaded states again, and should read through to the store instead.
+
+The exact solvers are stored under their own objectives, with their fixed point
+values stored as integers.
+
+The database uses write-ahead logging, so stores opened read-only can read while
+another process is writing without blocking each other.
+"""
+
+import hashlib
+import os
+import sqlite3
+from collections import defaultdict
+from types import TracebackType
+
+from dice_10001.chance_to_reach import ChanceToReachSolver, ExactChanceToReachSolver
+from dice_10001.expected_value import ExactExpectedValueSolver, ExpectedValueSolver
+from dice_10001.scoring import POINTS_TABLE
+from dice_10001.types import Score
+
+# Identifier for the scoring rules the stored states were solved with
+RULESET = (
+    "10000-"
+    + hashlib.sha256(repr(sorted(POINTS_TABLE.items())).encode()).hexdigest()[:16]
+)
+
+EV = "ev"
+CHANCE_TO_REACH = "chance_to_reach"
+EXACT_EV = "exact_ev"
+EXACT_CHANCE_TO_REACH = "exact_chance_to_reach"
+
+# The value column has no type, so that the integer values of the exact solvers are
+# stored without rounding
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS states (
+    ruleset TEXT NOT NULL,
+    objective TEXT NOT NULL,
+    parameter INTEGER NOT NULL,
+    dice INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    value NOT NULL,
+    PRIMARY KEY (ruleset, objective, parameter, dice, score, depth)
+) WITHOUT ROWID
+"""
+
+# A stored state is (dice_count, score, depth)
+StoredState = tuple[int, Score, int]
+
+
+class StateStore:
+    """
+    A persistent store for solved states
+
+    path: The path to the SQLite database. Created if it does not exist, unless
+          read_only is set.
+    read_only: Open the database for reading only. Any amount of read-only stores
+               can be opened alongside a writer.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], read_only: bool = False) -> None:
+        self.read_only = read_only
+        if read_only:
+            self._connection = sqlite3.connect(
+                f"file:{os.fspath(path)}?mode=ro", uri=True
+            )
+        else:
+            self._connection = sqlite3.connect(path)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(_SCHEMA)
+            self._connection.commit()
+
+    def __enter__(self) -> "StateStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection to the database"""
+        self._connection.close()
+
+    def load(
+        self, objective: str, parameter: int, ruleset: str = RULESET
+    ) -> dict[StoredState, float]:
+        """Return the stored values for the objective, keyed by (dice, score, depth)"""
+        rows = self._connection.execute(
+            "SELECT dice, score, depth, value FROM states "
+            "WHERE ruleset = ? AND objective = ? AND parameter = ?",
+            (ruleset, objective, parameter),
+        )
+        return {(dice, score, depth): value for dice, score, depth, value in rows}
+
+    def get(
+        self, objective: str, parameter: int, state: StoredState, ruleset: str = RULESET
+    ) -> float | None:
+        """Return the stored value of (dice, score, depth), or None if not stored"""
+        row = self._connection.execute(
+            "SELECT value FROM states WHERE ruleset = ? AND objective = ? "
+            "AND parameter = ? AND dice = ? AND score = ? AND depth = ?",
+            (ruleset, objective, parameter, *state),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def save(
+        self,
+        objective: str,
+        parameter: int,
+        values: dict[StoredState, float],
+        ruleset: str = RULESET,
+    ) -> None:
+        """Store the values for the objective, keeping any already stored values"""
+        assert not self.read_only
+
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO states VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (ruleset, objective, parameter, dice, score, depth, value)
+                    for (dice, score, depth), value in values.items()
+                ),
+            )
+
+    def parameters(self, objective: str, ruleset: str = RULESET) -> list[int]:
+        """Return the parameters that have stored values for the objective"""
+        rows = self._connection.execute(
+            "SELECT DISTINCT parameter FROM states "
+            "WHERE ruleset = ? AND objective = ? ORDER BY parameter",
+            (ruleset, objective),
+        )
+        return [parameter for (parameter,) in rows]
+
+
+def warm_ev_solver(
+    store: StateStore,
+    solver: ExpectedValueSolver | ExactExpectedValueSolver,
+    limit: int,
+) -> int:
+    """
+    Load the stored states for `limit` into the cache of `solver`
+
+    See the module docstring for when to use `read_through_ev_solver` instead.
+    Only converged states are used for the minimum score lookup of the solver, so
+    states stored from shallow queries do not affect later queries.
+    Returns the amount of loaded states
+    """
+    if isinstance(solver, ExactExpectedValueSolver):
+        values = store.load(EXACT_EV, limit)
+        solver.update(
+            {
+                (dice_count, score, depth, limit): int(ev)
+                for (dice_count, score, depth), ev in values.items()
+            }
+        )
+    else:
+        values = store.load(EV, limit)
+        solver.update(
+            {
+                (dice_count, score, depth, limit): ev
+                for (dice_count, score, depth), ev in values.items()
+            }
+        )
+    return len(values)
+
+
+def read_through_ev_solver(
+    store: StateStore, solver: ExpectedValueSolver | ExactExpectedValueSolver
+) -> None:
+    """Look up states missing from the cache of `solver` in the store"""
+    if isinstance(solver, ExactExpectedValueSolver):
+
+        def load_exact(key: tuple[int, Score, int, int]) -> int | None:
+            dice_count, score, depth, limit = key
+            ev = store.get(EXACT_EV, limit, (dice_count, score, depth))
+            return None if ev is None else int(ev)
+
+        solver.loader = load_exact
+    else:
+        solver.loader = lambda key: store.get(EV, key[3], (key[0], key[1], key[2]))
+
+
+def save_ev_solver(
+    store: StateStore, solver: ExpectedValueSolver | ExactExpectedValueSolver
+) -> None:
+    """Store the cached states of `solver` for every limit"""
+    values_per_limit: defaultdict[int, dict[StoredState, float]] = defaultdict(dict)
+    for (dice_count, score, depth, limit), ev in solver.snapshot().items():
+        values_per_limit[limit][(dice_count, score, depth)] = ev
+
+    objective = EXACT_EV if isinstance(solver, ExactExpectedValueSolver) else EV
+    for limit, values in values_per_limit.items():
+        store.save(objective, limit, values)
+
+
+def warm_chance_solver(
+    store: StateStore,
+    solver: ChanceToReachSolver | ExactChanceToReachSolver,
+    target: int,
+) -> int:
+    """
+    Load the stored states for `target` into the cache of `solver`
+
+    See the module docstring for when to use `read_through_chance_solver` instead.
+    Returns the amount of loaded states
+    """
+    if isinstance(solver, ExactChanceToReachSolver):
+        values = store.load(EXACT_CHANCE_TO_REACH, target)
+        solver.update(
+            {
+                (dice_count, score, target, depth): int(chance)
+                for (dice_count, score, depth), chance in values.items()
+            }
+        )
+    else:
+        values = store.load(CHANCE_TO_REACH, target)
+        solver.update(
+            {
+                (dice_count, score, target, depth): chance
+                for (dice_count, score, depth), chance in values.items()
+            }
+        )
+    return len(values)
+
+
+def read_through_chance_solver(
+    store: StateStore, solver: ChanceToReachSolver | ExactChanceToReachSolver
+) -> None:
+    """Look up states missing from the cache of `solver` in the store"""
+    if isinstance(solver, ExactChanceToReachSolver):
+
+        def load_exact(key: tuple[int, Score, int, int]) -> int | None:
+            dice_count, score, target, depth = key
+            chance = store.get(
+                EXACT_CHANCE_TO_REACH, target, (dice_count, score, depth)
+            )
+            return None if chance is None else int(chance)
+
+        solver.loader = load_exact
+    else:
+        solver.loader = lambda key: store.get(
+            CHANCE_TO_REACH, key[2], (key[0], key[1], key[3])
+        )
+
+
+def save_chance_solver(
+    store: StateStore, solver: ChanceToReachSolver | ExactChanceToReachSolver
+) -> None:
+    """Store the cached states of `solver` for every target"""
+    values_per_target: defaultdict[int, dict[StoredState, float]] = defaultdict(dict)
+    for (dice_count, score, target, depth), chance in solver.snapshot().items():
+        values_per_target[target][(dice_count, score, depth)] = chance
+
+    objective = (
+        EXACT_CHANCE_TO_REACH
+        if isinstance(solver, ExactChanceToReachSolver)
+        else CHANCE_TO_REACH
+    )
+    for target, values in values_per_target.items():
+        store.save(objective, target, values)
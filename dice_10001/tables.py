@@ -0,0 +1,130 @@
+"""
+Module providing a solver for tables over the whole score axis
+
+Instead of recursing from a single state, the tables hold the value of every
+(dice_count, score) below a score cap, and are filled from the top of the score axis
+down. Every score only depends on higher scores, so no depth limit is needed, and
+large targets and score caps stay cheap.
+
+Each score depends on the score 50 points above it, so the table is filled one score
+at a time. The work at a single score is too small to share between processes.
+"""
+
+from dataclasses import dataclass
+
+from dice_10001.expected_value import NEGATIVE_EV_SCORE
+from dice_10001.scoring import SCORE_STEP, best_outcomes_per_dice_count
+from dice_10001.types import DiceCount, Outcome, Score
+
+EV = "ev"
+CHANCE_TO_REACH = "chance_to_reach"
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreTable:
+    """
+    The value of each (dice_count, score) below `score_cap`
+
+    The values follow the order of `scores` for each dice count.
+    For expected value tables the values are the expected net gain as in
+    `estimate_ev`, and for chance to reach tables the chance to reach the cap.
+    """
+
+    objective: str
+    score_cap: int
+    scores: tuple[Score, ...]
+    values: dict[int, tuple[float, ...]]
+
+    def value(self, dice_count: int, score: Score) -> float:
+        """Return the value at (dice_count, score)"""
+        assert score % SCORE_STEP == 0
+        if score >= self.score_cap:
+            assert self.objective == CHANCE_TO_REACH
+            return 1.0
+        return self.values[dice_count][score // SCORE_STEP]
+
+
+@dataclass(frozen=True, slots=True)
+class _TableSpec:
+    """The table to solve"""
+
+    objective: str
+    score_cap: int
+    limit: int = 0
+
+    @property
+    def levels(self) -> int:
+        """The amount of scores in the table"""
+        return self.score_cap // SCORE_STEP
+
+
+def _solve(spec: _TableSpec) -> ScoreTable:
+    """Fill the table from the top of the score axis down"""
+    assert spec.score_cap > 0 and spec.score_cap % SCORE_STEP == 0
+
+    values: dict[int, list[float]] = {
+        dice_count: [0.0] * spec.levels for dice_count in range(1, 7)
+    }
+
+    def get_value(dice_count: int, score: Score) -> float:
+        """Return the value at (dice_count, score) from the finished scores"""
+        if score >= spec.score_cap:
+            # Expected value: never roll at the cap. Chance to reach: reached
+            return 0.0 if spec.objective == EV else 1.0
+        return values[dice_count][score // SCORE_STEP]
+
+    def contribution(score: Score, outcomes: tuple[Outcome, ...], weight: int) -> float:
+        """Return the weighted value of choosing the best of `outcomes`"""
+        if outcomes[0].dice == DiceCount.BUST:
+            assert len(outcomes) == 1
+            return (
+                float(-score * weight)
+                if spec.objective == EV and score >= spec.limit
+                else 0.0
+            )
+        if spec.objective == EV:
+            return weight * max(
+                outcome.points + max(get_value(outcome.dice, score + outcome.points), 0)
+                for outcome in outcomes
+            )
+        return weight * max(
+            get_value(outcome.dice, score + outcome.points) for outcome in outcomes
+        )
+
+    outcomes_per_dice_count = best_outcomes_per_dice_count()
+    for level in range(spec.levels - 1, -1, -1):
+        score = level * SCORE_STEP
+        for dice_count, outcomes_per_roll in outcomes_per_dice_count.items():
+            total_weight: int = 6**dice_count
+            values[dice_count][level] = (
+                sum(
+                    contribution(score, outcomes, weight)
+                    for outcomes, weight in outcomes_per_roll.items()
+                )
+                / total_weight
+            )
+
+    return ScoreTable(
+        objective=spec.objective,
+        score_cap=spec.score_cap,
+        scores=tuple(range(0, spec.score_cap, SCORE_STEP)),
+        values={dice_count: tuple(values[dice_count]) for dice_count in range(1, 7)},
+    )
+
+
+def solve_ev_table(limit: int = 0, score_cap: int | None = None) -> ScoreTable:
+    """
+    Solve the expected value of every (dice_count, score) below `score_cap`
+
+    limit: The minimum score that is treated as a loss if you bust. See `estimate_ev`
+    score_cap: The score where you always stop rolling. Defaults to one step above
+               the score where rolling any dice count gives negative expected value.
+    """
+    if score_cap is None:
+        score_cap = max(limit, NEGATIVE_EV_SCORE) + SCORE_STEP
+    return _solve(_TableSpec(EV, score_cap, limit))
+
+
+def solve_chance_table(target: int = 1000) -> ScoreTable:
+    """Solve the chance to reach `target` from every (dice_count, score) below it"""
+    return _solve(_TableSpec(CHANCE_TO_REACH, target))
@@ -1,15 +1,25 @@
+import argparse
 from collections import defaultdict
 from collections.abc import Callable
 from itertools import chain
 
-from dice_10001.chance_to_reach import estimate_chances_to_reach
+from dice_10001.chance_to_reach import DEFAULT_CHANCE_SOLVER, estimate_chances_to_reach
+from dice_10001.entry_phase import solve_entry_phases
 from dice_10001.expected_value import (
+    DEFAULT_EV_SOLVER,
     estimate_evs,
     estimate_min_score_for_negative_ev,
     reset_min_score_for_negative_ev,
 )
 from dice_10001.generate import generate_rolls
 from dice_10001.scoring import best_outcomes_per_dice_count, get_best_outcomes
+from dice_10001.store import (
+    StateStore,
+    save_chance_solver,
+    save_ev_solver,
+    warm_chance_solver,
+    warm_ev_solver,
+)
 from dice_10001.types import DiceCount
 
 
@@ -81,7 +91,7 @@ def print_dict_table(
     print_table(list(zip(*columns)))
 
 
-if __name__ == "__main__":
+def print_results() -> None:
     best_outcomes_per_dice_count  # Prevent unused import error
     """
     # Interesting performance optimization, but not relevant to actual play
@@ -125,7 +135,9 @@ if __name__ == "__main__":
         print(f"{dice_count}: {ev:>5.2f}")
 
     print("Minimum score for negative EV at given dice count:")
-    for dice_count, min_score in reversed(estimate_min_score_for_negative_ev().items()):
+    for dice_count, min_score in reversed(
+        estimate_min_score_for_negative_ev(limit=1000).items()
+    ):
         print(f"{dice_count}: {min_score:>5}")
 
     print("\nExpected value for given dice count/score with pointloss limit at 1000:")
@@ -155,3 +167,25 @@ if __name__ == "__main__":
         },
         lambda x: f"{x * 100:.2f}%",
     )
+
+    print("\nExpected turns to bank the entry threshold:")
+    for threshold, strategy in solve_entry_phases(range(500, 2050, 250)).items():
+        print(f"{threshold:>4}: {strategy.expected_turns:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print the tables in results.txt")
+    parser.add_argument(
+        "--store", help="SQLite database to load and save solved states to"
+    )
+    args = parser.parse_args()
+
+    if args.store:
+        with StateStore(args.store) as store:
+            warm_ev_solver(store, DEFAULT_EV_SOLVER, limit=0)
+            warm_chance_solver(store, DEFAULT_CHANCE_SOLVER, target=1000)
+            print_results()
+            save_ev_solver(store, DEFAULT_EV_SOLVER)
+            save_chance_solver(store, DEFAULT_CHANCE_SOLVER)
+    else:
+        print_results()
@@ -0,0 +1,17 @@
+"""
+Pytest configuration
+"""
+
+from _pytest.terminal import TerminalReporter
+
+from tests.differential import VERDICTS
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter) -> None:
+    """Report the verdict and speedup of each engine checked by the harness"""
+    if not VERDICTS:
+        return
+
+    terminalreporter.section("differential engine verdicts")
+    for verdict in VERDICTS:
+        terminalreporter.write_line(verdict.summary())
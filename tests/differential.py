@@ -0,0 +1,393 @@
+"""
+Differential test harness for alternative scoring and solver engines
+
+The current implementations of `generate_outcomes`, `get_best_outcomes`,
+`estimate_ev` and `estimate_chance_to_reach` are the reference. Alternative engines
+are registered with `register_engine`, and provide any subset of these functions.
+Each check compares an engine against the reference, times both, and records a
+`Verdict` with the speedup of the engine next to the result.
+"""
+
+import random
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from functools import cache
+from math import isclose
+
+from dice_10001.chance_to_reach import ChanceToReachSolver, ExactChanceToReachSolver
+from dice_10001.expected_value import (
+    NEGATIVE_EV_SCORE,
+    ExactExpectedValueSolver,
+    ExpectedValueSolver,
+)
+from dice_10001.generate import generate_rolls
+from dice_10001.scoring import SCORE_STEP, generate_outcomes, get_best_outcomes
+from dice_10001.tables import ScoreTable, solve_chance_table, solve_ev_table
+from dice_10001.types import Outcome, Roll, Score
+
+# Function estimating the ev for (dice_count, score, limit)
+EVFunction = Callable[[int, Score, int], float]
+
+# Function estimating the chance to reach target for (dice_count, score, target)
+ChanceFunction = Callable[[int, Score, int], float]
+
+# A state is (dice_count, score, limit) for ev and (dice_count, score, target) for
+# chance to reach
+State = tuple[int, Score, int]
+
+# Default tolerance for solver values
+TOLERANCE = 1e-9
+
+# The amount of failures to include in a verdict
+MAX_REPORTED_FAILURES = 5
+
+
+@dataclass(frozen=True, slots=True)
+class Engine:
+    """
+    An alternative implementation of some of the reference functions
+
+    The solvers are given as factories, so that each check runs with fresh caches.
+    """
+
+    name: str
+    generate_outcomes: Callable[[Roll], Iterable[Outcome]] | None = None
+    get_best_outcomes: Callable[[Roll], tuple[Outcome, ...]] | None = None
+    make_estimate_ev: Callable[[], EVFunction] | None = None
+    make_estimate_chance_to_reach: Callable[[], ChanceFunction] | None = None
+    tolerance: float = TOLERANCE
+
+
+@dataclass(frozen=True, slots=True)
+class Verdict:
+    """The result of checking an engine against the reference"""
+
+    engine: str
+    check: str
+    cases: int
+    max_error: float
+    reference_time: float
+    engine_time: float
+    failures: tuple[str, ...] = field(default=())
+
+    @property
+    def passed(self) -> bool:
+        """True if the engine agreed with the reference on all cases"""
+        return not self.failures
+
+    @property
+    def speedup(self) -> float:
+        """The time of the reference divided by the time of the engine"""
+        return self.reference_time / max(self.engine_time, 1e-9)
+
+    def summary(self) -> str:
+        """Return a one line summary of the verdict"""
+        return (
+            f"{self.engine:<24} {self.check:<26} "
+            f"{'PASS' if self.passed else 'FAIL'}  {self.cases:>6} cases  "
+            f"max error {self.max_error:.2e}  speedup {self.speedup:>7.2f}x"
+        )
+
+
+ENGINES: list[Engine] = []
+
+VERDICTS: list[Verdict] = []
+
+
+def register_engine(engine: Engine) -> Engine:
+    """Register an engine to be checked against the reference"""
+    assert engine.name not in (registered.name for registered in ENGINES)
+    ENGINES.append(engine)
+    return engine
+
+
+def engines_with(function: str) -> list[Engine]:
+    """Return the registered engines that provide `function`"""
+    return [engine for engine in ENGINES if getattr(engine, function) is not None]
+
+
+def _all_rolls() -> list[Roll]:
+    return [
+        roll
+        for dice_count in range(1, 7)
+        for roll, weight in generate_rolls(dice_count)
+    ]
+
+
+def _timed(function: Callable[[], list[object]]) -> tuple[list[object], float]:
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def _record(verdict: Verdict) -> Verdict:
+    VERDICTS.append(verdict)
+    return verdict
+
+
+def check_generate_outcomes(engine: Engine) -> Verdict:
+    """Check the outcomes of the engine for every roll of every dice count"""
+    assert engine.generate_outcomes is not None
+    engine_function = engine.generate_outcomes
+
+    rolls = _all_rolls()
+    expected, reference_time = _timed(
+        lambda: [set(generate_outcomes(roll)) for roll in rolls]
+    )
+    actual, engine_time = _timed(lambda: [set(engine_function(roll)) for roll in rolls])
+
+    return _record(
+        Verdict(
+            engine=engine.name,
+            check="generate_outcomes",
+            cases=len(rolls),
+            max_error=0,
+            reference_time=reference_time,
+            engine_time=engine_time,
+            failures=tuple(
+                f"{roll}: expected {e}, got {a}"
+                for roll, e, a in zip(rolls, expected, actual)
+                if e != a
+            )[:MAX_REPORTED_FAILURES],
+        )
+    )
+
+
+def check_get_best_outcomes(engine: Engine) -> Verdict:
+    """Check the best outcomes of the engine for every roll of every dice count"""
+    assert engine.get_best_outcomes is not None
+    engine_function = engine.get_best_outcomes
+
+    rolls = _all_rolls()
+    expected, reference_time = _timed(
+        lambda: [tuple(sorted(get_best_outcomes(roll))) for roll in rolls]
+    )
+    actual, engine_time = _timed(
+        lambda: [tuple(sorted(engine_function(roll))) for roll in rolls]
+    )
+
+    return _record(
+        Verdict(
+            engine=engine.name,
+            check="get_best_outcomes",
+            cases=len(rolls),
+            max_error=0,
+            reference_time=reference_time,
+            engine_time=engine_time,
+            failures=tuple(
+                f"{roll}: expected {e}, got {a}"
+                for roll, e, a in zip(rolls, expected, actual)
+                if e != a
+            )[:MAX_REPORTED_FAILURES],
+        )
+    )
+
+
+def results_states(parameter: int) -> tuple[State, ...]:
+    """The states that make up the tables in results.txt"""
+    return tuple(
+        (dice_count, score, parameter)
+        for score in range(0, 1050, 50)
+        for dice_count in range(1, 7)
+    )
+
+
+def random_states(
+    seed: int, size: int, max_score: Score, parameters: tuple[int, ...]
+) -> tuple[State, ...]:
+    """A random grid of states with scores on multiples of 50"""
+    rng = random.Random(seed)
+    return tuple(
+        (
+            rng.randint(1, 6),
+            50 * rng.randint(0, max_score // 50),
+            rng.choice(parameters),
+        )
+        for _ in range(size)
+    )
+
+
+# The highest score of the ev states, past the score where every dice count has
+# negative ev
+EV_MAX_SCORE = NEGATIVE_EV_SCORE + 1000
+
+# The states used to check the ev solvers: the results table and a random grid
+EV_STATES = results_states(0) + random_states(
+    seed=10001,
+    size=200,
+    max_score=EV_MAX_SCORE,
+    parameters=(0, 1000, 2000),
+)
+
+# The states used to check the chance to reach solvers
+CHANCE_STATES = results_states(1000) + random_states(
+    seed=10001, size=100, max_score=2000, parameters=(1000, 1500, 2000)
+)
+
+
+def reference_estimate_ev() -> EVFunction:
+    """Return the reference ev function with fresh caches"""
+    solver = ExpectedValueSolver()
+    return lambda dice_count, score, limit: solver.estimate_ev(
+        dice_count, score, limit=limit
+    )
+
+
+def reference_estimate_chance_to_reach() -> ChanceFunction:
+    """Return the reference chance to reach function with fresh caches"""
+    solver = ChanceToReachSolver()
+    return lambda dice_count, score, target: solver.estimate_chance_to_reach(
+        dice_count, score, target, target // 50 + 1
+    )
+
+
+@cache
+def _reference_values(
+    check: str, states: tuple[State, ...]
+) -> tuple[list[float], float]:
+    """Compute the reference values once per session"""
+    function = (
+        reference_estimate_ev()
+        if check == "ev"
+        else reference_estimate_chance_to_reach()
+    )
+    start = time.perf_counter()
+    values = [function(*state) for state in states]
+    return values, time.perf_counter() - start
+
+
+def _check_solver(
+    engine: Engine, check: str, function: EVFunction, states: tuple[State, ...]
+) -> Verdict:
+    expected, reference_time = _reference_values(check, states)
+
+    start = time.perf_counter()
+    actual = [function(*state) for state in states]
+    engine_time = time.perf_counter() - start
+
+    return _record(
+        Verdict(
+            engine=engine.name,
+            check=check,
+            cases=len(states),
+            max_error=max(abs(e - a) for e, a in zip(expected, actual)),
+            reference_time=reference_time,
+            engine_time=engine_time,
+            failures=tuple(
+                f"{state}: expected {e}, got {a}"
+                for state, e, a in zip(states, expected, actual)
+                if not isclose(e, a, rel_tol=engine.tolerance, abs_tol=engine.tolerance)
+            )[:MAX_REPORTED_FAILURES],
+        )
+    )
+
+
+def check_estimate_ev(engine: Engine, states: tuple[State, ...] = EV_STATES) -> Verdict:
+    """Check the ev of the engine on the given states"""
+    assert engine.make_estimate_ev is not None
+    return _check_solver(engine, "ev", engine.make_estimate_ev(), states)
+
+
+def check_estimate_chance_to_reach(
+    engine: Engine, states: tuple[State, ...] = CHANCE_STATES
+) -> Verdict:
+    """Check the chance to reach of the engine on the given states"""
+    assert engine.make_estimate_chance_to_reach is not None
+    return _check_solver(
+        engine, "chance_to_reach", engine.make_estimate_chance_to_reach(), states
+    )
+
+
+# The reference functions themselves, as a baseline for the speedups
+register_engine(
+    Engine(
+        name="reference",
+        generate_outcomes=generate_outcomes,
+        get_best_outcomes=get_best_outcomes,
+        make_estimate_ev=reference_estimate_ev,
+        make_estimate_chance_to_reach=reference_estimate_chance_to_reach,
+        tolerance=0,
+    )
+)
+
+
+def _bounded_estimate_ev() -> EVFunction:
+    solver = ExpectedValueSolver(maxsize=500)
+    return lambda dice_count, score, limit: solver.estimate_ev(
+        dice_count, score, limit=limit
+    )
+
+
+def _bounded_estimate_chance_to_reach() -> ChanceFunction:
+    solver = ChanceToReachSolver(maxsize=4000)
+    return lambda dice_count, score, target: solver.estimate_chance_to_reach(
+        dice_count, score, target, target // 50 + 1
+    )
+
+
+register_engine(
+    Engine(
+        name="bounded-cache",
+        make_estimate_ev=_bounded_estimate_ev,
+        make_estimate_chance_to_reach=_bounded_estimate_chance_to_reach,
+        tolerance=0,
+    )
+)
+
+
+def _exact_estimate_ev() -> EVFunction:
+    solver = ExactExpectedValueSolver()
+    return lambda dice_count, score, limit: solver.estimate_ev(
+        dice_count, score, limit=limit
+    )
+
+
+def _exact_estimate_chance_to_reach() -> ChanceFunction:
+    solver = ExactChanceToReachSolver()
+    return lambda dice_count, score, target: solver.estimate_chance_to_reach(
+        dice_count, score, target, target // 50 + 1
+    )
+
+
+register_engine(
+    Engine(
+        name="exact-integer",
+        make_estimate_ev=_exact_estimate_ev,
+        make_estimate_chance_to_reach=_exact_estimate_chance_to_reach,
+    )
+)
+
+
+def _table_estimate_ev() -> EVFunction:
+    tables: dict[int, ScoreTable] = {}
+
+    def estimate_ev(dice_count: int, score: Score, limit: int) -> float:
+        if limit not in tables:
+            # The default score cap is below the highest scores that are checked
+            tables[limit] = solve_ev_table(
+                limit=limit, score_cap=EV_MAX_SCORE + SCORE_STEP
+            )
+        return tables[limit].value(dice_count, score)
+
+    return estimate_ev
+
+
+def _table_estimate_chance_to_reach() -> ChanceFunction:
+    tables: dict[int, ScoreTable] = {}
+
+    def estimate_chance_to_reach(dice_count: int, score: Score, target: int) -> float:
+        if target not in tables:
+            tables[target] = solve_chance_table(target=target)
+        return tables[target].value(dice_count, score)
+
+    return estimate_chance_to_reach
+
+
+register_engine(
+    Engine(
+        name="table",
+        make_estimate_ev=_table_estimate_ev,
+        make_estimate_chance_to_reach=_table_estimate_chance_to_reach,
+    )
+)
@@ -0,0 +1,87 @@
+"""
+Tests for the bounded solver caches
+"""
+
+from dice_10001.cache import BoundedCache, CacheInfo
+from dice_10001.chance_to_reach import ChanceToReachSolver, estimate_chances_to_reach
+from dice_10001.expected_value import ExpectedValueSolver, estimate_ev
+
+
+def test_bounded_cache_evicts_least_recently_used() -> None:
+    """Assert that the least recently used entry is evicted when the cache is full"""
+    cache: BoundedCache[str, int] = BoundedCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+
+    assert cache.snapshot() == {"a": 1, "c": 3}
+    assert cache.get("b") is None
+    assert cache.info() == CacheInfo(hits=1, misses=1, size=2, maxsize=2)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.info() == CacheInfo(hits=0, misses=0, size=0, maxsize=2)
+
+
+def test_unbounded_cache() -> None:
+    """Assert that an unbounded cache keeps all entries"""
+    cache: BoundedCache[int, int] = BoundedCache()
+    cache.update({i: i**2 for i in range(1000)})
+    assert len(cache) == 1000
+    assert cache.get(0) == 0
+
+
+def test_bounded_solvers_give_same_results() -> None:
+    """Assert that solvers with small caches agree with the default solvers"""
+    ev_solver = ExpectedValueSolver(maxsize=400)
+    assert ev_solver.estimate_ev(6, 0, depth=4) == estimate_ev(6, 0, depth=4)
+    assert ev_solver.cache_info().size == 400
+
+    chance_solver = ChanceToReachSolver(maxsize=100)
+    assert chance_solver.estimate_chances_to_reach(
+        score=500
+    ) == estimate_chances_to_reach(score=500)
+    info = chance_solver.cache_info()
+    assert info.size == 100
+    assert info.hits > 0 and info.misses > 0
+
+    chance_solver.clear()
+    assert not chance_solver.snapshot()
+
+
+def test_shallow_query_does_not_affect_later_queries() -> None:
+    """Assert that a shallow query leaves no trace in the solver after clear()"""
+    solver = ExpectedValueSolver()
+    solver.estimate_ev(6, 0, depth=4)
+    solver.clear()
+    assert not solver.min_score_for_negative_ev
+
+    evs = solver.estimate_evs()
+    assert {dice_count: round(ev, 2) for dice_count, ev in evs.items()} == {
+        1: 217.15,
+        2: 185.01,
+        3: 197.23,
+        4: 240.80,
+        5: 336.84,
+        6: 590.66,
+    }
+    assert solver.estimate_min_score_for_negative_ev() == {
+        1: 350,
+        2: 250,
+        3: 450,
+        4: 1050,
+        5: 3100,
+        6: 18100,
+    }
+
+
+def test_bounded_ev_solver_does_not_recompute() -> None:
+    """Assert that a bounded ev solver solves each state about once"""
+    unbounded = ExpectedValueSolver()
+    evs = unbounded.estimate_evs()
+    assert len(unbounded.snapshot()) < 4000
+
+    solver = ExpectedValueSolver(maxsize=500)
+    assert solver.estimate_evs() == evs
+    assert solver.cache_info().misses < 1.1 * len(unbounded.snapshot())
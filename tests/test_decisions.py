@@ -0,0 +1,89 @@
+"""
+Tests for decision matrices
+"""
+
+import io
+from math import comb, isclose
+
+from dice_10001.chance_to_reach import estimate_chances_to_reach
+from dice_10001.decisions import (
+    Decision,
+    build_chance_decision_matrix,
+    build_ev_decision_matrix,
+)
+from dice_10001.expected_value import estimate_evs
+from dice_10001.generate import generate_rolls
+from dice_10001.types import Outcome
+
+
+def test_ev_decision_matrix_matches_ev() -> None:
+    """Assert that the weighted values of the best decisions give the expected value"""
+    scores = (0, 300, 1000)
+    for dice_count in range(1, 4):
+        matrix = build_ev_decision_matrix(dice_count, scores)
+        weights = [weight for roll, weight in generate_rolls(dice_count)]
+        for j, score in enumerate(scores):
+            total = sum(weight * row[j] for weight, row in zip(weights, matrix.values))
+            assert isclose(
+                total / 6**dice_count, estimate_evs(score=score)[dice_count]
+            ), f"Failed on {dice_count} dice at {score}"
+
+
+def test_chance_decision_matrix_matches_chance() -> None:
+    """Assert that the weighted values of the best decisions give the chance"""
+    scores = (0, 500, 950)
+    for dice_count in range(1, 4):
+        matrix = build_chance_decision_matrix(dice_count, scores, target=1000)
+        weights = [weight for roll, weight in generate_rolls(dice_count)]
+        for j, score in enumerate(scores):
+            total = sum(weight * row[j] for weight, row in zip(weights, matrix.values))
+            assert isclose(
+                total / 6**dice_count,
+                estimate_chances_to_reach(score=score, target=1000)[dice_count],
+            ), f"Failed on {dice_count} dice at {score}"
+
+
+def test_decision_matrix_shape() -> None:
+    """Assert that the matrix is dense over all rolls and scores"""
+    scores = tuple(range(0, 1050, 50))
+    matrix = build_chance_decision_matrix(3, scores)
+
+    assert len(matrix.rolls) == comb(6 + 3 - 1, 3)
+    for rows in (matrix.decisions, matrix.values, matrix.margins):
+        assert len(rows) == len(matrix.rolls)
+        assert all(len(row) == len(scores) for row in rows)
+
+    assert all(margin >= 0 for row in matrix.margins for margin in row)
+
+
+def test_decision_matrix_decisions() -> None:
+    """Assert that the best decisions are correct for some simple cases"""
+    matrix = build_ev_decision_matrix(1, (0, 1000))
+    decisions = dict(zip(matrix.rolls, matrix.decisions))
+
+    # Keeping a single scoring dice gives you all 6 dice back
+    assert decisions[(1,)] == (
+        Decision(Outcome(100, 6), True),
+        Decision(Outcome(100, 6), True),
+    )
+    assert decisions[(6,)] == (None, None)
+
+    matrix = build_chance_decision_matrix(2, (850,), target=1000)
+    decisions = dict(zip(matrix.rolls, matrix.decisions))
+
+    # Stop when reaching the target
+    assert decisions[(1, 5)] == (Decision(Outcome(150, 6), False),)
+    assert decisions[(1, 2)] == (Decision(Outcome(100, 1), True),)
+    assert decisions[(5, 6)] == (Decision(Outcome(50, 1), True),)
+
+
+def test_decision_matrix_csv() -> None:
+    """Assert that the csv export has one row per (roll, score)"""
+    matrix = build_ev_decision_matrix(2, (0, 50))
+    file = io.StringIO()
+    matrix.write_csv(file)
+    lines = file.getvalue().splitlines()
+
+    assert lines[0] == "roll,score,points,dice,roll_again,value,margin"
+    assert len(lines) == 1 + len(matrix.rolls) * 2
+    assert lines[1].startswith("1 1,0,200,6,1,")
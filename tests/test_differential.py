@@ -0,0 +1,67 @@
+"""
+Differential tests of the registered engines against the reference implementation
+"""
+
+from math import comb
+
+import pytest
+
+from dice_10001.scoring import generate_outcomes, get_best_outcomes
+from tests.differential import (
+    VERDICTS,
+    Engine,
+    check_estimate_chance_to_reach,
+    check_estimate_ev,
+    check_generate_outcomes,
+    check_get_best_outcomes,
+    engines_with,
+)
+
+
+def _engine_id(engine: Engine) -> str:
+    return engine.name
+
+
+@pytest.mark.parametrize("engine", engines_with("generate_outcomes"), ids=_engine_id)
+def test_generate_outcomes(engine: Engine) -> None:
+    """Assert that the engine generates the same outcomes for every roll"""
+    verdict = check_generate_outcomes(engine)
+    assert verdict.passed, verdict.failures
+
+
+@pytest.mark.parametrize("engine", engines_with("get_best_outcomes"), ids=_engine_id)
+def test_get_best_outcomes(engine: Engine) -> None:
+    """Assert that the engine finds the same best outcomes for every roll"""
+    verdict = check_get_best_outcomes(engine)
+    assert verdict.passed, verdict.failures
+
+
+@pytest.mark.parametrize("engine", engines_with("make_estimate_ev"), ids=_engine_id)
+def test_estimate_ev(engine: Engine) -> None:
+    """Assert that the engine estimates the same ev on the state grid"""
+    verdict = check_estimate_ev(engine)
+    assert verdict.passed, verdict.failures
+
+
+@pytest.mark.parametrize(
+    "engine", engines_with("make_estimate_chance_to_reach"), ids=_engine_id
+)
+def test_estimate_chance_to_reach(engine: Engine) -> None:
+    """Assert that the engine estimates the same chance to reach on the state grid"""
+    verdict = check_estimate_chance_to_reach(engine)
+    assert verdict.passed, verdict.failures
+
+
+def test_harness_detects_wrong_engine() -> None:
+    """Assert that the harness fails an engine that disagrees with the reference"""
+    engine = Engine(
+        name="wrong",
+        generate_outcomes=lambda roll: list(generate_outcomes(roll))[1:],
+        get_best_outcomes=lambda roll: get_best_outcomes(roll)[:1],
+    )
+
+    for verdict in (check_generate_outcomes(engine), check_get_best_outcomes(engine)):
+        # Keep the deliberately wrong engine out of the report
+        VERDICTS.remove(verdict)
+        assert not verdict.passed
+        assert verdict.cases == sum(comb(6 + n - 1, n) for n in range(1, 7))
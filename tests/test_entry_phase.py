@@ -0,0 +1,47 @@
+"""
+Tests for the entry phase solver
+"""
+
+from math import isclose
+
+from dice_10001.chance_to_reach import estimate_chances_to_reach
+from dice_10001.entry_phase import solve_entry_phase, solve_entry_phases
+from dice_10001.scoring import find_bust_chances
+
+
+def test_entry_phase_matches_chance_to_reach() -> None:
+    """Assert that minimizing turns maximizes the chance to reach the threshold"""
+    for threshold, strategy in solve_entry_phases(range(500, 1550, 500)).items():
+        chance = estimate_chances_to_reach(score=0, target=threshold)[6]
+        assert isclose(strategy.expected_turns, 1 / chance)
+        assert isclose(strategy.cost, strategy.expected_turns)
+        assert strategy.expected_score >= threshold
+
+
+def test_entry_phase_lowest_threshold() -> None:
+    """Assert that any scoring roll gets you on the board at the lowest threshold"""
+    strategy = solve_entry_phase(threshold=50)
+    assert isclose(strategy.expected_turns, 1 / (1 - find_bust_chances()[6]))
+
+
+def test_entry_phase_decisions() -> None:
+    """Assert that you roll until you reach the threshold, and bank after"""
+    strategy = solve_entry_phase(threshold=1000, score_cap=1500)
+    for dice_count, should_roll in strategy.should_roll.items():
+        for score, roll in zip(strategy.scores, should_roll):
+            assert roll == (score < 1000), f"Failed on {dice_count} dice at {score}"
+
+
+def test_entry_phase_surplus() -> None:
+    """Assert that rewarding surplus trades more turns for more points"""
+    base = solve_entry_phase(threshold=1000, score_cap=5000)
+    surplus = solve_entry_phase(threshold=1000, surplus_weight=0.001, score_cap=5000)
+
+    assert surplus.expected_turns > base.expected_turns
+    assert surplus.expected_score > base.expected_score
+    assert isclose(
+        surplus.cost,
+        surplus.expected_turns - surplus.surplus_weight * surplus.expected_score,
+    )
+    # Rolling again with 6 dice is worth it just above the threshold
+    assert surplus.should_roll[6][surplus.scores.index(1000)]
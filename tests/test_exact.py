@@ -0,0 +1,94 @@
+"""
+Tests for the exact solvers
+"""
+
+import random
+from math import isclose
+
+from dice_10001.chance_to_reach import (
+    ExactChanceToReachSolver,
+    estimate_chances_to_reach,
+)
+from dice_10001.exact import SCALE, divide, to_float
+from dice_10001.expected_value import ExactExpectedValueSolver, ExpectedValueSolver
+from dice_10001.scoring import best_outcomes_per_dice_count
+from dice_10001.types import Outcome
+
+
+def test_divide() -> None:
+    """Assert that division rounds to the nearest integer, rounding halves up"""
+    cases = (
+        ((10, 4), 3),
+        ((9, 4), 2),
+        ((11, 4), 3),
+        ((-10, 4), -2),
+        ((-11, 4), -3),
+        ((0, 7), 0),
+    )
+
+    for (numerator, denominator), result in cases:
+        assert divide(numerator, denominator) == result
+    assert to_float(SCALE // 2) == 0.5
+
+
+def _shuffled_outcomes(seed: int) -> dict[int, dict[tuple[Outcome, ...], int]]:
+    """Return the outcome groups in a random order"""
+    rng = random.Random(seed)
+    shuffled = {}
+    for dice_count, outcomes in best_outcomes_per_dice_count().items():
+        items = list(outcomes.items())
+        rng.shuffle(items)
+        shuffled[dice_count] = dict(items)
+    return shuffled
+
+
+def test_exact_solvers_are_order_independent() -> None:
+    """Assert that the exact results are bit-identical for any order of the outcomes"""
+    evs = {
+        ExactExpectedValueSolver(
+            outcomes_per_dice_count=_shuffled_outcomes(seed)
+        ).estimate_scaled_ev(6, 0, depth=5)
+        for seed in range(3)
+    }
+    assert len(evs) == 1
+
+    chances = {
+        ExactChanceToReachSolver(
+            outcomes_per_dice_count=_shuffled_outcomes(seed)
+        ).estimate_scaled_chance_to_reach(6, 0, target=1000, depth=21)
+        for seed in range(3)
+    }
+    assert len(chances) == 1
+
+
+def test_exact_solvers_are_independent_of_query_history() -> None:
+    """Assert that the exact results are bit-identical for any earlier queries"""
+    fresh_ev = ExactExpectedValueSolver().estimate_scaled_ev(6, 0)
+    fresh_shallow_ev = ExactExpectedValueSolver().estimate_scaled_ev(5, 300, depth=3)
+
+    solver = ExactExpectedValueSolver()
+    solver.estimate_scaled_ev(3, 450, depth=3)
+    solver.estimate_scaled_ev(4, 0, limit=1000)
+    assert solver.estimate_scaled_ev(6, 0) == fresh_ev
+    assert solver.estimate_scaled_ev(5, 300, depth=3) == fresh_shallow_ev
+
+    fresh_chance = ExactChanceToReachSolver().estimate_scaled_chance_to_reach(
+        6, 0, target=1000, depth=21
+    )
+    chance_solver = ExactChanceToReachSolver()
+    chance_solver.estimate_chances_to_reach(score=500, target=1000)
+    chance_solver.estimate_chances_to_reach(score=0, target=1500)
+    assert (
+        chance_solver.estimate_scaled_chance_to_reach(6, 0, target=1000, depth=21)
+        == fresh_chance
+    )
+
+
+def test_exact_solvers_match_float_solvers() -> None:
+    """Assert that the exact solvers agree with the float solvers"""
+    exact_ev = ExactExpectedValueSolver().estimate_ev(6, 0, depth=5)
+    assert isclose(exact_ev, ExpectedValueSolver().estimate_ev(6, 0, depth=5))
+
+    exact_chances = ExactChanceToReachSolver().estimate_chances_to_reach(score=300)
+    for dice_count, chance in estimate_chances_to_reach(score=300).items():
+        assert isclose(exact_chances[dice_count], chance)
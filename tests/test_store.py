@@ -0,0 +1,140 @@
+"""
+Tests for the persistent state store
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from dice_10001.chance_to_reach import ChanceToReachSolver, ExactChanceToReachSolver
+from dice_10001.expected_value import ExactExpectedValueSolver, ExpectedValueSolver
+from dice_10001.store import (
+    CHANCE_TO_REACH,
+    EV,
+    EXACT_EV,
+    StateStore,
+    read_through_chance_solver,
+    read_through_ev_solver,
+    save_chance_solver,
+    save_ev_solver,
+    warm_chance_solver,
+    warm_ev_solver,
+)
+
+
+def test_store_roundtrip(tmp_path: Path) -> None:
+    """Assert that stored values are loaded back for the same objective only"""
+    with StateStore(tmp_path / "states.db") as store:
+        store.save(EV, 0, {(6, 0, 400): 590.5, (1, 50, 399): -3.25})
+        store.save(EV, 1000, {(6, 0, 400): 766.0})
+        # Already stored values are kept
+        store.save(EV, 0, {(6, 0, 400): 0.0})
+
+        assert store.load(EV, 0) == {(6, 0, 400): 590.5, (1, 50, 399): -3.25}
+        assert store.load(EV, 1000) == {(6, 0, 400): 766.0}
+        assert not store.load(CHANCE_TO_REACH, 0)
+        assert not store.load(EV, 0, ruleset="other")
+        assert store.parameters(EV) == [0, 1000]
+
+
+def test_read_only_store(tmp_path: Path) -> None:
+    """Assert that a read-only store can read alongside a writer, but not write"""
+    path = tmp_path / "states.db"
+    with StateStore(path) as writer, StateStore(path, read_only=True) as reader:
+        writer.save(CHANCE_TO_REACH, 1000, {(6, 0, 21): 0.5})
+        assert reader.load(CHANCE_TO_REACH, 1000) == {(6, 0, 21): 0.5}
+
+        writer.save(CHANCE_TO_REACH, 1000, {(5, 0, 21): 0.25})
+        assert len(reader.load(CHANCE_TO_REACH, 1000)) == 2
+
+        with pytest.raises(sqlite3.OperationalError):
+            reader._connection.execute(  # pylint: disable=protected-access
+                "DELETE FROM states"
+            )
+
+
+def test_warm_solvers(tmp_path: Path) -> None:
+    """Assert that warmed solvers reuse the stored states and give the same results"""
+    ev_solver = ExpectedValueSolver()
+    chance_solver = ChanceToReachSolver()
+    ev = ev_solver.estimate_ev(6, 0, depth=4)
+    chances = chance_solver.estimate_chances_to_reach(score=500, target=1000)
+
+    with StateStore(tmp_path / "states.db") as store:
+        save_ev_solver(store, ev_solver)
+        save_chance_solver(store, chance_solver)
+
+    with StateStore(tmp_path / "states.db", read_only=True) as store:
+        ev_solver = ExpectedValueSolver()
+        chance_solver = ChanceToReachSolver()
+        assert warm_ev_solver(store, ev_solver, limit=0) == len(ev_solver.snapshot())
+        assert warm_chance_solver(store, chance_solver, target=1000) > 0
+
+    assert ev_solver.estimate_ev(6, 0, depth=4) == ev
+    assert ev_solver.cache_info().misses == 0
+    # The stored states from the shallow query do not affect full depth queries
+    assert ev_solver.estimate_evs() == ExpectedValueSolver().estimate_evs()
+
+    assert chance_solver.estimate_chances_to_reach(score=500, target=1000) == chances
+    assert chance_solver.cache_info().misses == 0
+
+    # Extending the range only solves the missing states
+    chance_solver.estimate_chances_to_reach(score=0, target=1000)
+    info = chance_solver.cache_info()
+    assert 0 < info.misses < info.size
+
+
+def test_exact_solvers_roundtrip(tmp_path: Path) -> None:
+    """Assert that the exact solvers are stored without rounding their values"""
+    ev_solver = ExactExpectedValueSolver()
+    chance_solver = ExactChanceToReachSolver()
+    ev_solver.estimate_evs(score=1000)
+    chance_solver.estimate_chances_to_reach(score=500, target=1000)
+
+    with StateStore(tmp_path / "states.db") as store:
+        save_ev_solver(store, ev_solver)
+        save_chance_solver(store, chance_solver)
+        # The float solvers do not see the exact states
+        assert not store.load(EV, 0)
+        assert store.parameters(EXACT_EV) == [0]
+
+        warmed_ev_solver = ExactExpectedValueSolver()
+        warmed_chance_solver = ExactChanceToReachSolver()
+        warm_ev_solver(store, warmed_ev_solver, limit=0)
+        warm_chance_solver(store, warmed_chance_solver, target=1000)
+
+    assert warmed_ev_solver.snapshot() == ev_solver.snapshot()
+    assert warmed_chance_solver.snapshot() == chance_solver.snapshot()
+    assert warmed_ev_solver.estimate_evs(score=1000) == ev_solver.estimate_evs(
+        score=1000
+    )
+    assert warmed_ev_solver.cache_info().misses == 0
+
+
+def test_read_through_bounded_solvers(tmp_path: Path) -> None:
+    """Assert that bounded solvers read stored states on cache misses"""
+    ev_solver = ExpectedValueSolver()
+    chance_solver = ChanceToReachSolver()
+    evs = ev_solver.estimate_evs()
+    chances = chance_solver.estimate_chances_to_reach(score=500, target=1000)
+
+    with StateStore(tmp_path / "states.db") as store:
+        save_ev_solver(store, ev_solver)
+        save_chance_solver(store, chance_solver)
+
+        ev_solver = ExpectedValueSolver(maxsize=100)
+        chance_solver = ChanceToReachSolver(maxsize=100)
+        read_through_ev_solver(store, ev_solver)
+        read_through_chance_solver(store, chance_solver)
+
+        # Every state is found in the store, so nothing is solved
+        assert ev_solver.estimate_evs() == evs
+        assert ev_solver.cache_info().misses == 6
+        assert ev_solver.estimate_min_score_for_negative_ev() == {
+            dice_count: 10_000_000 for dice_count in range(1, 7)
+        }
+        assert (
+            chance_solver.estimate_chances_to_reach(score=500, target=1000) == chances
+        )
+        assert chance_solver.cache_info().misses == 6
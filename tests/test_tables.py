@@ -0,0 +1,35 @@
+"""
+Tests for the table solver
+"""
+
+from math import isclose
+
+from dice_10001.chance_to_reach import estimate_chances_to_reach
+from dice_10001.expected_value import estimate_evs
+from dice_10001.tables import solve_chance_table, solve_ev_table
+
+
+def test_tables_match_solvers() -> None:
+    """Assert that the tables agree with the recursive solvers"""
+    ev_table = solve_ev_table()
+    for dice_count, ev in estimate_evs(score=0).items():
+        assert isclose(ev_table.value(dice_count, 0), ev)
+
+    chance_table = solve_chance_table(target=1000)
+    for score in (0, 500, 950, 1000):
+        chances = estimate_chances_to_reach(score=score, target=1000)
+        for dice_count, chance in chances.items():
+            assert isclose(chance_table.value(dice_count, score), chance)
+
+
+def test_large_score_cap() -> None:
+    """Assert that expected value tables reach the score where you stop rolling"""
+    table = solve_ev_table(limit=1000)
+    assert table.score_cap == 18_150
+    # Rolling 6 dice has negative expected value from 18100
+    assert table.value(6, 18_050) > 0 > table.value(6, 18_100)
+
+    # States above the default score cap do not change the values below it
+    larger = solve_ev_table(limit=1000, score_cap=20_000)
+    for dice_count, values in table.values.items():
+        assert larger.values[dice_count][: len(values)] == values